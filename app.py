@@ -14,12 +14,15 @@ from utils import (
     load_questions,
     match_role_skills,
     get_questions_for_role,
-    rank_questions_by_similarity,
+    rank_questions_multi,
+    build_question_vectors,
+    build_question_index,
     calculate_difficulty_score,
     init_spacy_model,
     TECH_SKILLS
 )
 import io
+import csv
 from datetime import datetime
 
 # Page configuration
@@ -54,6 +57,12 @@ st.markdown("""
         border-radius: 15px;
         font-size: 0.9rem;
     }
+    .skill-badge-matched {
+        background-color: #c8e6c9;
+    }
+    .skill-badge-missing {
+        background-color: #ffcdd2;
+    }
     .match-score {
         font-size: 2rem;
         font-weight: bold;
@@ -86,18 +95,20 @@ if 'resume_text' not in st.session_state:
     st.session_state.resume_text = ""
 if 'extracted_skills' not in st.session_state:
     st.session_state.extracted_skills = []
+    st.session_state.extracted_skills_set = frozenset()
 if 'selected_role' not in st.session_state:
     st.session_state.selected_role = None
+if 'match_results' not in st.session_state:
+    st.session_state.match_results = None
+    st.session_state.match_key = None
 
-# Initialize spaCy model
-@st.cache_resource
+# Initialize spaCy model (loaded on first resume upload, not at startup)
+@st.cache_resource(show_spinner=False)
 def load_nlp_model():
     """Load spaCy model with caching"""
     init_spacy_model()
     return True
 
-load_nlp_model()
-
 # Main header
 st.markdown('<h1 class="main-header">💼 AI Interview Question Generator</h1>', unsafe_allow_html=True)
 st.markdown('<p class="sub-header">Upload your resume, select a job role, and get personalized interview questions!</p>', unsafe_allow_html=True)
@@ -125,6 +136,63 @@ def load_data():
 
 job_roles_df, questions_df = load_data()
 
+# Question bank TF-IDF (fitted sklearn objects belong in cache_resource)
+@st.cache_resource
+def load_question_vectors():
+    """Fit the question bank TF-IDF once per process"""
+    return build_question_vectors(questions_df)
+
+question_vectors = load_question_vectors()
+
+# Questions grouped by (role, type) for constant-time lookups; cache_resource
+# hands back the same dict each rerun instead of unpickling a copy
+@st.cache_resource
+def load_question_index():
+    """Group the question bank by role and question type once"""
+    return build_question_index(questions_df)
+
+question_index = load_question_index()
+
+# Skill matching (shared by the analysis and statistics tabs)
+@st.cache_data(show_spinner=False)
+def cached_match_role_skills(role, skills, job_roles_df):
+    """Match resume skills with role requirements, cached across reruns"""
+    # skills is the sorted tuple of lowercase skills, a stable cache key
+    return match_role_skills(role, frozenset(skills), job_roles_df)
+
+def get_match_results(role):
+    """Match results for the role, computed once per rerun and reused by both tabs"""
+    skills_set = st.session_state.extracted_skills_set
+    match_key = (role, skills_set)
+    if st.session_state.match_key != match_key:
+        st.session_state.match_results = cached_match_role_skills(role, tuple(sorted(skills_set)), job_roles_df)
+        st.session_state.match_key = match_key
+    return st.session_state.match_results
+
+# Question ranking (the resume doesn't change between reruns)
+@st.cache_data(show_spinner=False)
+def cached_rank_questions(resume_text, question_dict, top_n=10, _question_vectors=None):
+    """Rank all question categories against the resume, cached across reruns"""
+    return rank_questions_multi(resume_text, question_dict, top_n=top_n,
+                                question_vectors=_question_vectors)
+
+# CSV download (only rebuilt when the role or its questions change)
+@st.cache_data(show_spinner=False)
+def build_questions_csv(role, questions):
+    """Serialize (category, question, difficulty) rows to CSV bytes"""
+    csv_buffer = io.StringIO()
+    writer = csv.writer(csv_buffer)
+    writer.writerow(["Category", "Question", "Difficulty", "Job Role"])
+    writer.writerows((category, question, difficulty, role) for category, question, difficulty in questions)
+    return csv_buffer.getvalue().encode()
+
+# Skill badges (spacing comes from the .skill-badge margin)
+def skill_badges(skills, variant=None):
+    """Build the HTML for a row of skill badges"""
+    css_class = f"skill-badge skill-badge-{variant}" if variant else "skill-badge"
+    prefix = f'<span class="{css_class}">'
+    return "".join(f'{prefix}{skill}</span>' for skill in skills)
+
 # Main content area
 tab1, tab2, tab3 = st.tabs(["📄 Resume Upload", "🔍 Analysis & Questions", "📊 Statistics"])
 
@@ -163,8 +231,10 @@ with tab1:
                 
                 # Extract skills
                 with st.spinner("Extracting skills from resume..."):
+                    load_nlp_model()
                     extracted_skills = extract_skills_simple(resume_text)
                     st.session_state.extracted_skills = extracted_skills
+                    st.session_state.extracted_skills_set = frozenset(s.lower() for s in extracted_skills)
                 
                 st.success("✅ Resume processed successfully!")
                 
@@ -175,8 +245,7 @@ with tab1:
                 # Display extracted skills
                 if extracted_skills:
                     st.subheader("🎯 Extracted Skills")
-                    skills_html = " ".join([f'<span class="skill-badge">{skill}</span>' for skill in extracted_skills])
-                    st.markdown(skills_html, unsafe_allow_html=True)
+                    st.markdown(skill_badges(extracted_skills), unsafe_allow_html=True)
                     st.write(f"**Total Skills Found:** {len(extracted_skills)}")
                 else:
                     st.warning("⚠️ No skills detected in the resume. Make sure your resume contains technical skills and keywords.")
@@ -211,11 +280,7 @@ with tab2:
                 st.markdown("---")
                 st.subheader("🔗 Skill Matching Analysis")
                 
-                match_results = match_role_skills(
-                    selected_role,
-                    st.session_state.extracted_skills,
-                    job_roles_df
-                )
+                match_results = get_match_results(selected_role)
                 
                 # Display match score
                 col1, col2, col3 = st.columns(3)
@@ -232,20 +297,12 @@ with tab2:
                 # Display matched skills
                 if match_results['matched_skills']:
                     st.write("**✅ Matched Skills:**")
-                    matched_skills_html = " ".join([
-                        f'<span class="skill-badge" style="background-color: #c8e6c9;">{skill}</span>' 
-                        for skill in match_results['matched_skills']
-                    ])
-                    st.markdown(matched_skills_html, unsafe_allow_html=True)
+                    st.markdown(skill_badges(match_results['matched_skills'], "matched"), unsafe_allow_html=True)
                 
                 # Display missing skills
                 if match_results['missing_skills']:
                     st.write("**⚠️ Missing Skills (Recommended to add):**")
-                    missing_skills_html = " ".join([
-                        f'<span class="skill-badge" style="background-color: #ffcdd2;">{skill}</span>' 
-                        for skill in match_results['missing_skills']
-                    ])
-                    st.markdown(missing_skills_html, unsafe_allow_html=True)
+                    st.markdown(skill_badges(match_results['missing_skills'], "missing"), unsafe_allow_html=True)
                 
                 # Generate and display questions
                 st.markdown("---")
@@ -253,43 +310,41 @@ with tab2:
                 
                 if not questions_df.empty:
                     # Get questions for each category
-                    technical_questions = get_questions_for_role(selected_role, "Technical", questions_df)
-                    behavioral_questions = get_questions_for_role(selected_role, "Behavioral", questions_df)
-                    scenario_questions = get_questions_for_role(selected_role, "Scenario-based", questions_df)
+                    technical_questions = get_questions_for_role(selected_role, "Technical", questions_df, question_index)
+                    behavioral_questions = get_questions_for_role(selected_role, "Behavioral", questions_df, question_index)
+                    scenario_questions = get_questions_for_role(selected_role, "Scenario-based", questions_df, question_index)
                     
                     # Rank questions by similarity to resume
                     if st.session_state.resume_text:
-                        if technical_questions:
-                            technical_questions = rank_questions_by_similarity(
-                                st.session_state.resume_text,
-                                technical_questions,
-                                top_n=10
-                            )
-                        if behavioral_questions:
-                            behavioral_questions = rank_questions_by_similarity(
-                                st.session_state.resume_text,
-                                behavioral_questions,
-                                top_n=10
-                            )
-                        if scenario_questions:
-                            scenario_questions = rank_questions_by_similarity(
-                                st.session_state.resume_text,
-                                scenario_questions,
-                                top_n=10
-                            )
+                        ranked = cached_rank_questions(
+                            st.session_state.resume_text,
+                            {
+                                "Technical": technical_questions,
+                                "Behavioral": behavioral_questions,
+                                "Scenario-based": scenario_questions
+                            },
+                            top_n=10,
+                            _question_vectors=question_vectors
+                        )
+                        technical_questions = ranked["Technical"]
+                        behavioral_questions = ranked["Behavioral"]
+                        scenario_questions = ranked["Scenario-based"]
                     
-                    # Display questions by category
+                    # Display questions by category, scoring each question once
                     question_categories = {
                         "🛠️ Technical Questions": technical_questions,
                         "💬 Behavioral Questions": behavioral_questions,
                         "🎯 Scenario-based Questions": scenario_questions
                     }
+                    question_categories = {
+                        category_name: [(q, calculate_difficulty_score(q)) for q in questions]
+                        for category_name, questions in question_categories.items()
+                    }
                     
                     for category_name, questions in question_categories.items():
                         if questions:
                             with st.expander(category_name, expanded=True):
-                                for idx, question in enumerate(questions, 1):
-                                    difficulty = calculate_difficulty_score(question)
+                                for idx, (question, difficulty) in enumerate(questions, 1):
                                     difficulty_class = f"difficulty-{difficulty.lower()}"
                                     
                                     st.markdown(f"""
@@ -306,24 +361,14 @@ with tab2:
                     st.subheader("💾 Download Questions")
                     
                     # Prepare download data
-                    all_questions_data = []
-                    for category_name, questions in question_categories.items():
-                        for question in questions:
-                            difficulty = calculate_difficulty_score(question)
-                            all_questions_data.append({
-                                "Category": category_name.replace("🛠️ ", "").replace("💬 ", "").replace("🎯 ", ""),
-                                "Question": question,
-                                "Difficulty": difficulty,
-                                "Job Role": selected_role
-                            })
+                    all_questions_data = tuple(
+                        (category_name.replace("🛠️ ", "").replace("💬 ", "").replace("🎯 ", ""), question, difficulty)
+                        for category_name, questions in question_categories.items()
+                        for question, difficulty in questions
+                    )
                     
                     if all_questions_data:
-                        download_df = pd.DataFrame(all_questions_data)
-                        
-                        # Convert to CSV
-                        csv_buffer = io.StringIO()
-                        download_df.to_csv(csv_buffer, index=False)
-                        csv_data = csv_buffer.getvalue()
+                        csv_data = build_questions_csv(selected_role, all_questions_data)
                         
                         st.download_button(
                             label="📥 Download Questions as CSV",
@@ -364,11 +409,7 @@ with tab3:
         with col2:
             st.subheader("🎯 Role Match Statistics")
             if st.session_state.selected_role and not job_roles_df.empty:
-                match_results = match_role_skills(
-                    st.session_state.selected_role,
-                    st.session_state.extracted_skills,
-                    job_roles_df
-                )
+                match_results = get_match_results(st.session_state.selected_role)
                 
                 # Create match visualization
                 match_data = {
@@ -3,17 +3,18 @@ Utility functions for Resume Analysis and Interview Question Generation
 """
 
 import re
+from functools import lru_cache
 import PyPDF2
 import pandas as pd
 from docx import Document
 from io import BytesIO
-import spacy
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 
-# Load spaCy model (will be initialized in app)
+# Load spaCy model (lazily initialized by the app on first resume upload)
 nlp = None
+SKILL_MATCHER = None
 
 # Common IT/Technical Skills Vocabulary
 TECH_SKILLS = [
@@ -53,15 +54,74 @@ SOFT_SKILLS = [
     'project management', 'critical thinking', 'adaptability', 'creativity', 'collaboration'
 ]
 
+# Precompiled skill matcher: one alternation, longest skills first so that
+# e.g. 'react native' wins over 'react' and 'html5' over 'html'. The zero-width
+# lookahead tries every position without consuming text, so skills that overlap
+# across a word ('system design patterns') are all found. Skills are lowercase
+# and so is the text it runs on, so no IGNORECASE is needed.
+_SKILL_RE = re.compile(
+    r'(?=\b(' + '|'.join(map(re.escape, sorted(set(TECH_SKILLS), key=len, reverse=True))) + r')\b)'
+)
+_SKILL_CANON = {s.lower(): s.title() for s in TECH_SKILLS}
+
+# Skills that start with or sit inside a longer skill ('react' in 'react native');
+# the lookahead only reports the longest skill at each position
+_SKILL_PARTS = {
+    skill: tuple(part for part in _SKILL_CANON
+                 if part != skill and re.search(r'\b' + re.escape(part) + r'\b', skill))
+    for skill in _SKILL_CANON
+}
+_SKILL_PARTS = {skill: parts for skill, parts in _SKILL_PARTS.items() if parts}
+
+# Difficulty keywords
+HARD_KEYWORDS = ['design', 'architecture', 'scalability', 'distributed', 'algorithm',
+                 'complexity', 'optimization', 'system design', 'concurrency']
+MEDIUM_KEYWORDS = ['explain', 'difference', 'how', 'what', 'describe', 'implement']
+EASY_KEYWORDS = ['define', 'list', 'name', 'what is', 'basic']
+
+
+def _keyword_regex(keywords):
+    """Compile keywords into one alternation anchored at the start of a word"""
+    return re.compile(r'\b(' + '|'.join(map(re.escape, sorted(keywords, key=len, reverse=True))) + r')')
+
+
+# Leading \b keeps 'algorithms' matching 'algorithm' but stops 'show' matching 'how'
+_HARD_RE = _keyword_regex(HARD_KEYWORDS)
+_MEDIUM_RE = _keyword_regex(MEDIUM_KEYWORDS)
+_EASY_RE = _keyword_regex(EASY_KEYWORDS)
+
+# Keywords that also occur inside a longer one in the same list ('design' in 'system design')
+_KEYWORD_PARTS = {
+    keyword: tuple(part for part in keywords if part != keyword and part in keyword)
+    for keywords in (HARD_KEYWORDS, MEDIUM_KEYWORDS, EASY_KEYWORDS)
+    for keyword in keywords
+}
+_KEYWORD_PARTS = {keyword: parts for keyword, parts in _KEYWORD_PARTS.items() if parts}
+
 
 def init_spacy_model():
-    """Initialize spaCy model for NLP processing"""
-    global nlp
+    """
+    Initialize spaCy model for NLP processing
+    
+    The regex pass in extract_skills_simple already finds every TECH_SKILLS
+    entry on word boundaries; spaCy only adds token-based matches such as
+    'c++'. It is therefore imported and loaded on demand rather than at startup.
+    """
+    global nlp, SKILL_MATCHER
     try:
-        nlp = spacy.load("en_core_web_sm")
-    except OSError:
+        import spacy
+        from spacy.matcher import PhraseMatcher
+        
+        # Only the tokenizer is used; exclude (unlike disable) never builds the
+        # trained components, so their weights aren't read into memory at all
+        nlp = spacy.load("en_core_web_sm",
+                         exclude=["tok2vec", "tagger", "parser", "senter", "ner", "lemmatizer", "attribute_ruler"])
+        SKILL_MATCHER = PhraseMatcher(nlp.vocab, attr="LOWER")
+        SKILL_MATCHER.add("TECH", [nlp.make_doc(skill) for skill in TECH_SKILLS])
+    except (ImportError, OSError):
         print("Warning: spaCy model 'en_core_web_sm' not found. Please run: python -m spacy download en_core_web_sm")
         nlp = None
+        SKILL_MATCHER = None
 
 
 def extract_text_from_pdf(file) -> str:
@@ -76,10 +136,8 @@ def extract_text_from_pdf(file) -> str:
     """
     try:
         pdf_reader = PyPDF2.PdfReader(file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text
+        # extract_text() can return None for image-only pages
+        return "\n".join(page.extract_text() or "" for page in pdf_reader.pages)
     except Exception as e:
         raise Exception(f"Error extracting text from PDF: {str(e)}")
 
@@ -115,49 +173,70 @@ def extract_skills_simple(text: str) -> list:
     if not text:
         return []
     
-    text_lower = text.lower()
-    found_skills = []
-    
-    # Check for technical skills
-    for skill in TECH_SKILLS:
-        # Match whole words only
-        pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            found_skills.append(skill.title())
+    return extract_skills_batch([text])[0]
+
+
+def extract_skills_batch(texts: list, batch_size: int = 32) -> list:
+    """
+    Extract skills from several texts (resumes or resume sections) at once
     
-    # Use spaCy for additional skill extraction if available
-    if nlp:
+    Args:
+        texts: List of texts
+        batch_size: Number of texts spaCy tokenizes per batch
+        
+    Returns:
+        List of extracted skill lists, one per text
+    """
+    texts = [text or "" for text in texts]
+    all_skills = []
+    
+    # Check for technical skills in a single pass over each text
+    for text in texts:
+        found_skills = set()
+        for match in _SKILL_RE.finditer(text.lower()):
+            skill = match.group(1)
+            found_skills.add(_SKILL_CANON[skill])
+            # Alternation consumes the longest skill, so add any it contains
+            found_skills.update(_SKILL_CANON[part] for part in _SKILL_PARTS.get(skill, ()))
+        all_skills.append(found_skills)
+    
+    # Use spaCy's tokenizer for skills the word-boundary regex can't see (e.g. 'c++').
+    # Stay in-process: n_process > 1 is unreliable on Windows and only tokenization runs.
+    if nlp and SKILL_MATCHER:
         try:
-            doc = nlp(text)
-            # Extract nouns and proper nouns that might be skills
-            for token in doc:
-                if token.pos_ in ['NOUN', 'PROPN'] and len(token.text) > 2:
-                    token_lower = token.text.lower()
-                    if token_lower in TECH_SKILLS and token.text.title() not in found_skills:
-                        found_skills.append(token.text.title())
+            for found_skills, doc in zip(all_skills, nlp.pipe(texts, batch_size=batch_size)):
+                for _, start, end in SKILL_MATCHER(doc):
+                    found_skills.add(doc[start:end].text.title())
         except:
             pass
     
-    # Remove duplicates and return
-    return sorted(list(set(found_skills)))
+    return [sorted(found_skills) for found_skills in all_skills]
+
+def parse_skills(skills_str) -> frozenset:
+    """Parse a comma-separated skills string into a set of lowercase skills"""
+    return frozenset(s.strip() for s in str(skills_str).lower().split(',') if s.strip())
+
 
 def load_job_roles(path):
     try:
-        df = pd.read_csv(path, on_bad_lines='skip', engine='python', skip_blank_lines=True)
         expected_cols = ['Job_Role', 'Key_Skills']
-        df = df[[col for col in df.columns if col in expected_cols]]
-        return df.dropna(subset=['Job_Role', 'Key_Skills'])
+        df = pd.read_csv(path, on_bad_lines='skip', engine='c', dtype='string', skip_blank_lines=True,
+                         usecols=lambda col: col in expected_cols)
+        df = df.dropna(subset=['Job_Role', 'Key_Skills'])
+        # Parse the comma-separated skills once instead of on every match
+        df['Key_Skills_Set'] = df['Key_Skills'].map(parse_skills)
+        return df
     except Exception as e:
         print(f"❌ Error loading job roles: {e}")
-        return pd.DataFrame(columns=['Job_Role', 'Key_Skills'])
+        return pd.DataFrame(columns=['Job_Role', 'Key_Skills', 'Key_Skills_Set'])
 
 
 
 def load_questions(path):
     try:
-        df = pd.read_csv(path, on_bad_lines='skip', engine='python', skip_blank_lines=True)
         expected_cols = ['Job_Role', 'Question_Type', 'Question', 'Difficulty']
-        df = df[[col for col in df.columns if col in expected_cols]]
+        df = pd.read_csv(path, on_bad_lines='skip', engine='c', dtype='string', skip_blank_lines=True,
+                         usecols=lambda col: col in expected_cols)
         if 'Difficulty' not in df.columns:
             df['Difficulty'] = 'Medium'
         return df.dropna(subset=['Job_Role', 'Question_Type', 'Question'])
@@ -173,7 +252,8 @@ def match_role_skills(role: str, resume_skills: list, job_roles_df: pd.DataFrame
     
     Args:
         role: Selected job role
-        resume_skills: List of skills extracted from resume
+        resume_skills: Skills extracted from resume. A set or frozenset must
+            already be lowercase and is used as-is; other iterables are lowercased
         job_roles_df: DataFrame containing job roles and required skills
         
     Returns:
@@ -188,43 +268,63 @@ def match_role_skills(role: str, resume_skills: list, job_roles_df: pd.DataFrame
     
     # Get required skills for the role
     role_row = job_roles_df[job_roles_df['Job_Role'] == role].iloc[0]
-    required_skills_str = str(role_row['Key_Skills']).lower()
-    
-    # Parse required skills (assuming comma-separated)
-    required_skills = [s.strip() for s in required_skills_str.split(',')]
-    
-    # Normalize resume skills for comparison
-    resume_skills_lower = [s.lower() for s in resume_skills]
-    
-    # Find matched and missing skills
-    matched_skills = []
-    missing_skills = []
+    if 'Key_Skills_Set' in job_roles_df.columns:
+        required_set = role_row['Key_Skills_Set']
+    else:
+        required_set = parse_skills(role_row['Key_Skills'])
     
-    for req_skill in required_skills:
-        matched = False
-        for res_skill in resume_skills_lower:
-            # Check for partial matches
-            if req_skill in res_skill or res_skill in req_skill:
-                matched_skills.append(req_skill.title())
-                matched = True
-                break
-        if not matched:
-            missing_skills.append(req_skill.title())
+    # Normalize resume skills for comparison, unless the caller keeps a lowercased set
+    if isinstance(resume_skills, (set, frozenset)):
+        resume_set = resume_skills
+    else:
+        resume_set = {s.lower() for s in resume_skills}
+    
+    # Exact matches via set intersection
+    matched = set(required_set & resume_set)
+    missing = set()
+    
+    # Fall back to whole-word partial matches for the rest, so 'machine learning ops'
+    # still covers 'machine learning' but 'javascript' no longer covers 'java'
+    resume_words = [frozenset(s.split()) for s in resume_set if s.strip()]
+    for req_skill in required_set - matched:
+        req_words = frozenset(req_skill.split())
+        if any(req_words <= words or words <= req_words for words in resume_words):
+            matched.add(req_skill)
+        else:
+            missing.add(req_skill)
     
     # Calculate match score
-    if len(required_skills) > 0:
-        match_score = (len(matched_skills) / len(required_skills)) * 100
+    if required_set:
+        match_score = (len(matched) / len(required_set)) * 100
     else:
         match_score = 0
     
     return {
-        'matched_skills': sorted(list(set(matched_skills))),
-        'missing_skills': sorted(list(set(missing_skills))),
+        'matched_skills': sorted(s.title() for s in matched),
+        'missing_skills': sorted(s.title() for s in missing),
         'match_score': round(match_score, 2)
     }
 
 
-def get_questions_for_role(role: str, question_type: str, questions_df: pd.DataFrame) -> list:
+def build_question_index(questions_df: pd.DataFrame) -> dict:
+    """
+    Group questions by role and type once so lookups don't rescan the DataFrame
+    
+    Args:
+        questions_df: DataFrame containing questions
+        
+    Returns:
+        Dictionary mapping (role, question type) to tuple of questions
+    """
+    if questions_df.empty:
+        return {}
+    
+    # Tuples so callers can share the cached lists without copying them
+    return questions_df.groupby(['Job_Role', 'Question_Type'], sort=False)['Question'].apply(tuple).to_dict()
+
+
+def get_questions_for_role(role: str, question_type: str, questions_df: pd.DataFrame,
+                           question_index: dict = None) -> list:
     """
     Get questions for a specific role and type
     
@@ -232,10 +332,14 @@ def get_questions_for_role(role: str, question_type: str, questions_df: pd.DataF
         role: Job role
         question_type: Type of question (Technical, Behavioral, Scenario-based)
         questions_df: DataFrame containing questions
+        question_index: Optional output of build_question_index
         
     Returns:
-        List of questions
+        List of questions (a shared tuple when served from question_index)
     """
+    if question_index is not None:
+        return question_index.get((role, question_type), ())
+    
     if questions_df.empty:
         return []
     
@@ -246,7 +350,59 @@ def get_questions_for_role(role: str, question_type: str, questions_df: pd.DataF
     return filtered['Question'].tolist()
 
 
-def rank_questions_by_similarity(resume_text: str, questions: list, top_n: int = 10) -> list:
+def build_question_vectors(questions_df: pd.DataFrame):
+    """
+    Fit TF-IDF once on the whole question bank so ranking only transforms the resume
+    
+    Args:
+        questions_df: DataFrame containing questions
+        
+    Returns:
+        Tuple of (vectorizer, question matrix, question -> row lookup), or None
+    """
+    if questions_df.empty:
+        return None
+    
+    try:
+        questions = questions_df['Question'].tolist()
+        vectorizer = TfidfVectorizer(max_features=5000, stop_words='english')
+        question_matrix = vectorizer.fit_transform(questions)
+        question_rows = {question: i for i, question in enumerate(questions)}
+        return vectorizer, question_matrix, question_rows
+    except Exception as e:
+        print(f"Error building question vectors: {str(e)}")
+        return None
+
+
+def _question_similarities(resume_text: str, questions: list, question_vectors=None):
+    """Cosine similarity between the resume text and each question"""
+    if question_vectors is not None:
+        vectorizer, question_matrix, question_rows = question_vectors
+        if all(question in question_rows for question in questions):
+            resume_vector = vectorizer.transform([resume_text])
+            question_slice = question_matrix[[question_rows[q] for q in questions]]
+            # TF-IDF rows are already L2-normalized, so the dot product is the cosine
+            return (resume_vector @ question_slice.T).toarray()[0]
+    
+    # Combine resume text with questions and fit a vectorizer on the fly
+    vectorizer = TfidfVectorizer(max_features=100, stop_words='english')
+    tfidf_matrix = vectorizer.fit_transform([resume_text] + questions)
+    return cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:])[0]
+
+
+def _top_indices(similarities, top_n: int):
+    """Indices of the top_n highest scores, best first, without a full sort"""
+    # Scores are in [0, 1], so float32 is plenty for the comparisons
+    similarities = np.asarray(similarities).astype(np.float32, copy=False)
+    k = min(top_n, len(similarities))
+    if k <= 0:
+        return np.array([], dtype=int)
+    top = np.argpartition(-similarities, k - 1)[:k]
+    return top[np.argsort(-similarities[top])]
+
+
+def rank_questions_by_similarity(resume_text: str, questions: list, top_n: int = 10,
+                                 question_vectors=None) -> list:
     """
     Rank questions by similarity to resume text using TF-IDF
     
@@ -254,6 +410,7 @@ def rank_questions_by_similarity(resume_text: str, questions: list, top_n: int =
         resume_text: Resume text
         questions: List of questions
         top_n: Number of top questions to return
+        question_vectors: Optional output of build_question_vectors
         
     Returns:
         Ranked list of questions
@@ -262,21 +419,11 @@ def rank_questions_by_similarity(resume_text: str, questions: list, top_n: int =
         return questions[:top_n] if questions else []
     
     try:
-        # Combine resume text with questions
-        documents = [resume_text] + questions
-        
-        # Create TF-IDF vectorizer
-        vectorizer = TfidfVectorizer(max_features=100, stop_words='english')
-        tfidf_matrix = vectorizer.fit_transform(documents)
-        
         # Calculate cosine similarity between resume and questions
-        resume_vector = tfidf_matrix[0:1]
-        question_vectors = tfidf_matrix[1:]
-        
-        similarities = cosine_similarity(resume_vector, question_vectors)[0]
+        similarities = _question_similarities(resume_text, questions, question_vectors)
         
         # Get indices of top similar questions
-        top_indices = np.argsort(similarities)[::-1][:top_n]
+        top_indices = _top_indices(similarities, top_n)
         
         # Return ranked questions
         ranked_questions = [questions[i] for i in top_indices]
@@ -286,6 +433,56 @@ def rank_questions_by_similarity(resume_text: str, questions: list, top_n: int =
         return questions[:top_n]
 
 
+def rank_questions_multi(resume_text: str, question_dict: dict, top_n: int = 10,
+                         question_vectors=None) -> dict:
+    """
+    Rank several question lists by similarity to resume text using one TF-IDF fit
+    
+    Args:
+        resume_text: Resume text
+        question_dict: Mapping of category to list of questions
+        top_n: Number of top questions to return per category
+        question_vectors: Optional output of build_question_vectors
+        
+    Returns:
+        Mapping of category to ranked list of questions
+    """
+    # Pool all questions, remembering where each category's slice lives
+    flat_questions = []
+    offsets = {}
+    for category, questions in question_dict.items():
+        offsets[category] = (len(flat_questions), len(flat_questions) + len(questions))
+        flat_questions.extend(questions)
+    
+    if not flat_questions or not resume_text:
+        return {category: questions[:top_n] for category, questions in question_dict.items()}
+    
+    try:
+        # Calculate cosine similarity between resume and all questions at once
+        similarities = _question_similarities(resume_text, flat_questions, question_vectors)
+        
+        # Rank each category within its own slice
+        ranked = {}
+        for category, (start, end) in offsets.items():
+            top_indices = _top_indices(similarities[start:end], top_n)
+            ranked[category] = [flat_questions[start + i] for i in top_indices]
+        return ranked
+    except Exception as e:
+        print(f"Error in ranking questions: {str(e)}")
+        return {category: questions[:top_n] for category, questions in question_dict.items()}
+
+
+def _count_keywords(pattern, text: str) -> int:
+    """Count the distinct difficulty keywords found in already-lowercased text"""
+    found = set()
+    for match in pattern.finditer(text):
+        keyword = match.group(1)
+        found.add(keyword)
+        found.update(_KEYWORD_PARTS.get(keyword, ()))
+    return len(found)
+
+
+@lru_cache(maxsize=1024)
 def calculate_difficulty_score(question: str) -> str:
     """
     Simple heuristic to determine question difficulty
@@ -297,24 +494,15 @@ def calculate_difficulty_score(question: str) -> str:
         Difficulty level: Easy, Medium, or Hard
     """
     question_lower = question.lower()
+    word_count = len(question.split())
     
-    # Hard keywords
-    hard_keywords = ['design', 'architecture', 'scalability', 'distributed', 'algorithm', 
-                     'complexity', 'optimization', 'system design', 'concurrency']
-    
-    # Medium keywords
-    medium_keywords = ['explain', 'difference', 'how', 'what', 'describe', 'implement']
-    
-    # Easy keywords
-    easy_keywords = ['define', 'list', 'name', 'what is', 'basic']
-    
-    hard_count = sum(1 for kw in hard_keywords if kw in question_lower)
-    medium_count = sum(1 for kw in medium_keywords if kw in question_lower)
-    easy_count = sum(1 for kw in easy_keywords if kw in question_lower)
+    hard_count = _count_keywords(_HARD_RE, question_lower)
+    medium_count = _count_keywords(_MEDIUM_RE, question_lower)
+    easy_count = _count_keywords(_EASY_RE, question_lower)
     
-    if hard_count >= 2 or len(question.split()) > 30:
+    if hard_count >= 2 or word_count > 30:
         return "Hard"
-    elif medium_count > easy_count or len(question.split()) > 15:
+    elif medium_count > easy_count or word_count > 15:
         return "Medium"
     else:
         return "Easy"
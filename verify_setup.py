@@ -1,70 +1,277 @@
 """
 Quick verification script to check if all dependencies are installed correctly
+
+Pass --quick to only check Python packages and CSV files (skips the spaCy model).
+Pass --all to keep checking packages after the first missing one (by default
+the script stops there).
+
+Exit status is a bitmask so callers can tell which check failed. It stays
+below 126 so it can't be mistaken for the shell's 126/127 or 128 + signal codes:
+    0        everything passed
+    1-63     bit i set = CHECKS[i] is not installed, for i < 5; bit 5 = CHECKS[5]
+             or any later package is not installed. With the bundled
+             requirements.txt bit 5 therefore covers numpy, scikit-learn and the
+             optional packages after them; the output names each one. Model/CSV
+             checks are skipped, and without --all only the first missing
+             package is reported
+    64 + n   dependencies are fine, but in n: bit 0 = spaCy model missing,
+             bit 1 + j = CSV_FILES[j] missing or empty
 """
 
 import sys
+import os
+import re
+import hashlib
+import pickle
+import tempfile
+import importlib.util
+import importlib.metadata
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+QUICK = "--quick" in sys.argv
+FULL = "--all" in sys.argv
+
+SEP = "=" * 50
+
+# Emoji only on a UTF-8 terminal; plain ASCII for pipes, CI logs and legacy code pages
+_UTF8_TTY = (sys.stdout is not None and sys.stdout.isatty()
+             and (sys.stdout.encoding or "").lower().replace("-", "") == "utf8")
+_TICK = "✅" if _UTF8_TTY else "[OK]"
+_CROSS = "❌" if _UTF8_TTY else "[FAIL]"
+# The [OK]/[FAIL] markers already say it, so only the emoji lines spell it out
+_OK = _TICK + (" {} - OK" if _UTF8_TTY else " {}")
+_FAIL = _CROSS + (" {} - FAILED: {}" if _UTF8_TTY else " {} - {}")
+
+REQUIREMENTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "requirements.txt")
+
+# Distributions whose import name isn't just the project name with '-' -> '_'.
+# Anything missing here is still found through its installed metadata.
+_ALIAS = {
+    "python_docx": "docx", "scikit_learn": "sklearn", "pyyaml": "yaml",
+    "beautifulsoup4": "bs4", "pillow": "PIL", "opencv_python": "cv2",
+    "python_dateutil": "dateutil", "pymupdf": "fitz",
+}
+
+# Core packages to check when requirements.txt is missing or lists nothing
+DEFAULT_CHECKS = (
+    ("streamlit", "Streamlit"),
+    ("PyPDF2", "PyPDF2"),
+    ("docx", "python-docx"),
+    ("spacy", "spaCy"),
+    ("pandas", "pandas"),
+    ("numpy", "numpy"),
+    ("sklearn", "scikit-learn"),
+)
 
-def check_import(module_name, package_name=None):
-    """Check if a module can be imported"""
+def load_checks(path=REQUIREMENTS_FILE):
+    """Build (module name, package name) pairs from requirements.txt"""
+    checks = []
     try:
-        __import__(module_name)
-        print(f"✅ {package_name or module_name} - OK")
+        with open(path) as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                # pip options (-r, -e, --index-url ...) and bare URL/VCS/path requirements name no package
+                if line.startswith(("-", ".", "/")) or "://" in line.split("@", 1)[0]:
+                    continue
+                match = re.match(r"[A-Za-z0-9][A-Za-z0-9._-]*", line)
+                if not match:
+                    continue
+                package_name = match.group(0)
+                # Dotted distributions such as zope.interface are probed by their top-level package
+                module_name = package_name.replace("-", "_").split(".")[0]
+                checks.append((_ALIAS.get(module_name.lower(), module_name), package_name))
+    except OSError:
+        return DEFAULT_CHECKS
+    # Never pass with nothing to check
+    return tuple(checks) or DEFAULT_CHECKS
+
+CHECKS = load_checks()
+
+CSV_FILES = ["job_roles.csv", "interview_questions.csv"]
+# Import probes running ahead of the one being reported
+_MAX_IN_FLIGHT = 4
+
+# Exit status layout (see the module docstring)
+_PACKAGE_BITS = 6
+_DATA_FLAG = 1 << _PACKAGE_BITS
+CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "smart-interviewbot", "verify.pkl")
+
+@lru_cache(maxsize=None)
+def is_installed(module_name):
+    """Check if a module can be found, remembering the answer for repeat calls"""
+    # Locate the module without executing it; only installation matters here.
+    # find_spec returns None for a missing top-level module, but raises for a
+    # dotted name whose parent is missing or for an invalid name.
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+@lru_cache(maxsize=None)
+def is_distribution_installed(package_name):
+    """Check the installed package metadata, for import names we can't guess"""
+    try:
+        importlib.metadata.distribution(package_name)
         return True
-    except ImportError as e:
-        print(f"❌ {package_name or module_name} - FAILED: {e}")
+    except (importlib.metadata.PackageNotFoundError, ValueError):
         return False
 
+def check_import(module_name, package_name, out):
+    """Check if a module is installed, appending the result line to out"""
+    # The import probe is the fast path; metadata covers e.g. PyYAML -> yaml
+    ok = is_installed(module_name) or bool(package_name) and is_distribution_installed(package_name)
+    name = package_name or module_name
+    out.append((_OK.format(name) if ok else _FAIL.format(name, "not found")) + "\n")
+    return ok
+
+def buffered_check_import(module_name, package_name=None):
+    """Run check_import into a private list so threaded output doesn't interleave"""
+    out = []
+    return check_import(module_name, package_name, out), out
+
+def cache_key():
+    """Fingerprint the interpreter, its import paths, the CSV files and this script"""
+    path_mtimes = [(p, os.stat(p).st_mtime_ns) for p in sys.path if os.path.isdir(p)]
+    csv_mtimes = [(f, os.stat(f).st_mtime_ns if os.path.exists(f) else None) for f in CSV_FILES]
+    # The script's own mtime keeps an older version's output and exit codes from being replayed
+    script_mtime = os.stat(os.path.abspath(__file__)).st_mtime_ns
+    fingerprint = (sys.executable, os.getcwd(), path_mtimes, csv_mtimes, CHECKS, script_mtime,
+                   _UTF8_TTY, QUICK, FULL)
+    return hashlib.blake2b(repr(fingerprint).encode()).hexdigest()
+
+def load_cached_result(key):
+    """Return (output, exit code) from the last run if nothing has changed since"""
+    # A stale, truncated or foreign cache file is just a miss, never an error
+    try:
+        with open(CACHE_FILE, "rb") as f:
+            cached = pickle.load(f)
+        if cached.get("key") != key:
+            return None
+        return cached["output"], cached["code"]
+    except Exception:
+        return None
+
+def save_cached_result(key, output, code):
+    """Write the result atomically so a concurrent run never reads half a file"""
+    try:
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(CACHE_FILE))
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump({"key": key, "output": output, "code": code}, f)
+        os.replace(tmp_path, CACHE_FILE)
+    except OSError:
+        pass
+
 def main():
-    print("=" * 50)
-    print("Verifying Dependencies")
-    print("=" * 50)
+    """Run the checks, reusing the previous result when the environment is unchanged"""
+    key = cache_key()
+    cached = load_cached_result(key)
+    if cached is not None:
+        output, code = cached
+        sys.stdout.write(output + "(cached result - nothing changed since the last run)\n")
+        sys.exit(code)
     
-    checks = [
-        ("streamlit", "Streamlit"),
-        ("PyPDF2", "PyPDF2"),
-        ("docx", "python-docx"),
-        ("spacy", "spaCy"),
-        ("pandas", "pandas"),
-        ("numpy", "numpy"),
-        ("sklearn", "scikit-learn"),
-    ]
+    # Collect every line and write once at the end
+    out = []
+    code = run_checks(out)
+    output = "".join(out)
+    sys.stdout.write(output)
+    save_cached_result(key, output, code)
+    sys.exit(code)
+
+def csv_sizes():
+    """Map each CSV in the working directory to its size in bytes"""
+    # One directory listing, then a size lookup only for the CSVs we care about
+    sizes = {}
+    with os.scandir(".") as entries:
+        for entry in entries:
+            if entry.name not in CSV_FILES:
+                continue
+            try:
+                sizes[entry.name] = entry.stat().st_size
+            except OSError:
+                # Dangling symlink or unreadable entry: leave it out so it reports "Not found"
+                pass
+    return sizes
+
+def run_checks(out):
+    """Run all checks, appending output lines to out; returns the exit code"""
+    out.append(SEP + "\n")
+    out.append("Verifying Dependencies\n")
+    out.append(SEP + "\n")
+    if CHECKS is DEFAULT_CHECKS:
+        out.append(f"{_CROSS} Could not read any packages from {REQUIREMENTS_FILE}; checking the core set instead\n")
     
-    results = []
-    for module, name in checks:
-        results.append(check_import(module, name))
+    # Every probe is independent disk I/O, so run the imports, the model check and
+    # the CSV listing concurrently, then report them in the usual order. Only
+    # _MAX_IN_FLIGHT imports are submitted ahead, so stopping at the first missing
+    # package really skips probing the rest.
+    pool = ThreadPoolExecutor(max_workers=_MAX_IN_FLIGHT + 2)
+    try:
+        model_future = pool.submit(is_installed, "en_core_web_sm") if not QUICK else None
+        csv_future = pool.submit(csv_sizes)
+        futures = [pool.submit(buffered_check_import, module, name) for module, name in CHECKS[:_MAX_IN_FLIGHT]]
+        
+        # None marks packages that were never reported because we stopped early
+        results = [None] * len(CHECKS)
+        for i in range(len(CHECKS)):
+            results[i], lines = futures[i].result()
+            out.extend(lines)
+            if not results[i] and not FULL:
+                out.append("   (stopped at the first missing package; pass --all to check the rest)\n")
+                break
+            # Keep the window full as each result is consumed
+            nxt = i + _MAX_IN_FLIGHT
+            if nxt < len(CHECKS):
+                futures.append(pool.submit(buffered_check_import, *CHECKS[nxt]))
+    finally:
+        pool.shutdown(wait=True)
+    
+    code = 0
+    for i, ok in enumerate(results):
+        if ok is False:
+            code |= 1 << min(i, _PACKAGE_BITS - 1)
     
-    print("\n" + "=" * 50)
+    out.append("\n" + SEP + "\n")
     if all(results):
-        print("✅ All dependencies are installed correctly!")
-        print("=" * 50)
+        out.append(f"{_TICK} All dependencies are installed correctly!\n")
+        out.append(SEP + "\n")
         
-        # Check spaCy model
-        try:
-            import spacy
-            nlp = spacy.load("en_core_web_sm")
-            print("✅ spaCy model 'en_core_web_sm' is installed")
-        except OSError:
-            print("❌ spaCy model 'en_core_web_sm' is NOT installed")
-            print("   Run: python -m spacy download en_core_web_sm")
+        # Check spaCy model (installed as a regular package, so no need to import spacy)
+        if model_future is not None:
+            if model_future.result():
+                out.append(f"{_TICK} spaCy model 'en_core_web_sm' is installed\n")
+            else:
+                out.append(f"{_CROSS} spaCy model 'en_core_web_sm' is NOT installed\n")
+                out.append("   Run: python -m spacy download en_core_web_sm\n")
+                code |= 1
         
         # Check CSV files
-        import os
-        csv_files = ["job_roles.csv", "interview_questions.csv"]
-        print("\nChecking CSV files:")
-        for csv_file in csv_files:
-            if os.path.exists(csv_file):
-                print(f"✅ {csv_file} - Found")
+        out.append("\nChecking CSV files:\n")
+        sizes = csv_future.result()
+        for j, csv_file in enumerate(CSV_FILES):
+            size = sizes.get(csv_file)
+            if size:
+                out.append(f"{_TICK} {csv_file} - Found ({size}B)\n")
             else:
-                print(f"❌ {csv_file} - Not found")
+                # An empty file would only fail later when pandas reads it
+                status = "Not found" if size is None else "Empty (0B)"
+                out.append(f"{_CROSS} {csv_file} - {status}\n")
+                code |= 1 << (1 + j)
         
-        print("\n" + "=" * 50)
-        print("Setup verification complete!")
-        print("You can now run: streamlit run app.py")
+        out.append("\n" + SEP + "\n")
+        if code:
+            out.append(f"{_CROSS} Setup verification failed - fix the items marked above first\n")
+        else:
+            out.append("Setup verification complete!\n")
+            out.append("You can now run: streamlit run app.py\n")
     else:
-        print("❌ Some dependencies are missing!")
-        print("Please run: pip install -r requirements.txt")
-        print("=" * 50)
-        sys.exit(1)
+        out.append(f"{_CROSS} Some dependencies are missing!\n")
+        out.append("Please run: pip install -r requirements.txt\n")
+        out.append(SEP + "\n")
+        return code
+    return _DATA_FLAG | code if code else 0
 
 if __name__ == "__main__":
     main()